@@ -0,0 +1,81 @@
+import numpy as np
+from numpy.typing import NDArray
+
+try:
+    import numba
+except ImportError:
+    numba = None  # type: ignore[assignment]
+
+
+def worst_case_sqsum(s_stack: NDArray[np.complex128]) -> float:
+    """Sum over frequency of the squared worst-case |S| across a set.
+
+    `s_stack` is a (Nset, Nfreq) complex array; equivalent to
+    np.sum(np.abs(s_stack).max(axis=0) ** 2) but fused into one pass
+    when numba is available.
+    """
+    return float(np.sum(np.abs(s_stack).max(axis=0) ** 2))
+
+
+def vswr_bounds(
+    s_stack: NDArray[np.complex128],
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Per-frequency min/max VSWR across a set of reflection traces.
+
+    `s_stack` is a (Nset, Nfreq) complex array; equivalent to reducing
+    (1+|s|)/(1-|s|) over the set axis, fused into one pass when numba
+    is available.
+    """
+    mag = np.abs(s_stack)
+    vswr = (1.0 + mag) / (1.0 - mag)
+    return vswr.min(axis=0), vswr.max(axis=0)
+
+
+if numba is not None:
+
+    @numba.njit(cache=True, fastmath=True)
+    def _worst_case_sqsum_loop(s_stack: NDArray[np.complex128]) -> float:
+        nset, nfreq = s_stack.shape
+        total = 0.0
+        for f in range(nfreq):
+            worst = 0.0
+            for n in range(nset):
+                mag = abs(s_stack[n, f])
+                if mag > worst:
+                    worst = mag
+            total += worst * worst
+        return total
+
+    def worst_case_sqsum(s_stack: NDArray[np.complex128]) -> float:  # noqa: F811
+        return float(_worst_case_sqsum_loop(np.ascontiguousarray(s_stack)))
+
+    @numba.njit(cache=True, fastmath=True)
+    def _vswr_bounds_loop(
+        s_stack: NDArray[np.complex128],
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        nset, nfreq = s_stack.shape
+        lo = np.empty(nfreq)
+        hi = np.empty(nfreq)
+        for f in range(nfreq):
+            lo_v = np.inf
+            hi_v = -np.inf
+            for n in range(nset):
+                mag = abs(s_stack[n, f])
+                vswr = (1.0 + mag) / (1.0 - mag)
+                if vswr < lo_v:
+                    lo_v = vswr
+                if vswr > hi_v:
+                    hi_v = vswr
+            lo[f] = lo_v
+            hi[f] = hi_v
+        return lo, hi
+
+    def vswr_bounds(  # noqa: F811
+        s_stack: NDArray[np.complex128],
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        lo, hi = _vswr_bounds_loop(np.ascontiguousarray(s_stack))
+        return lo, hi
+
+    # compile eagerly so callers never pay for it mid-request
+    worst_case_sqsum(np.zeros((1, 1), dtype=np.complex128))
+    vswr_bounds(np.zeros((1, 1), dtype=np.complex128))
@@ -1,15 +1,34 @@
 import itertools
-import warnings
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, auto
-from typing import Iterator
+from typing import Any, Callable, Iterator
 
 import numpy as np
 import skrf as rf
-from scipy.optimize import minimize
+from numpy.typing import NDArray
+from scipy.optimize import differential_evolution, minimize
 
 from . import passives
+from ._kernels import worst_case_sqsum
 from .typing import ArchParams, ComponentList, Network, NetworkSet, Toleranced
 
+try:
+    import numba
+except ImportError:
+    numba = None  # type: ignore[assignment]
+
+# start point (geometric mean of the component range) and bounds are
+# constants for the lifetime of the process
+_X0 = (
+    (np.max(passives.INDUCTORS[:, 0]) * np.min(passives.INDUCTORS[:, 0])) ** 0.5,
+    (np.max(passives.CAPACITORS[:, 0]) * np.min(passives.CAPACITORS[:, 0])) ** 0.5,
+)
+_BOUNDS = (
+    (1e-3, 2 * np.max(passives.INDUCTORS[:, 0])),
+    (1e-3, 2 * np.max(passives.CAPACITORS[:, 0])),
+)
+
 
 class Arch(Enum):
     LshuntCseries = auto()
@@ -22,15 +41,31 @@ class OptimizerArgs:
     ntwk: Network
     bandlimited_ntwk: Network
     frequency: str | None
+    omega: NDArray[np.float64]
+    gamma_ant: NDArray[np.complex128]
+    z0: NDArray[np.complex128]
+    line: rf.DefinedGammaZ0
+    global_search: bool
 
     def __init__(
-        self, ntwk: Network, frequency: str | None = None, max_points: int | None = None
+        self,
+        ntwk: Network,
+        frequency: str | None = None,
+        max_points: int | None = 64,
+        global_search: bool = False,
     ):
+        """Optimization input; `max_points` caps the in-band frequency
+        resolution used during optimization (None keeps every point).
+        Final results are projected back onto the full network by
+        `expand_result`. `global_search` runs a short differential
+        evolution per arch before the local polish, guarding against
+        local minima at the cost of extra objective evaluations."""
         if ntwk.number_of_ports != 1:
             raise ValueError("network must be 1-port")
 
         self.ntwk = ntwk
         self.frequency = frequency
+        self.global_search = global_search
         if self.frequency:
             freq_subset = self.ntwk.frequency[self.frequency]
             if max_points is not None and freq_subset.npoints > max_points:
@@ -44,8 +79,23 @@ class OptimizerArgs:
         else:
             self.bandlimited_ntwk = self.ntwk
 
+        # precomputed contiguous arrays for the closed-form objective; the
+        # inner loop never touches the Network objects
+        self.omega = np.ascontiguousarray(
+            2 * np.pi * self.bandlimited_ntwk.frequency.f, dtype=np.float64
+        )
+        self.gamma_ant = np.ascontiguousarray(
+            self.bandlimited_ntwk.s[:, 0, 0], dtype=np.complex128
+        )
+        self.z0 = np.ascontiguousarray(
+            self.bandlimited_ntwk.z0[:, 0], dtype=np.complex128
+        )
+        self.line = rf.DefinedGammaZ0(frequency=self.bandlimited_ntwk.frequency)
+
 
 class OptimizeResult:
+    __slots__ = ("arch", "x", "ntwk")
+
     arch: Arch
     x: ArchParams
     ntwk: Network
@@ -58,83 +108,281 @@ class OptimizeResult:
 
 
 class OptimizeResultToleranced:
+    __slots__ = ("arch", "x", "ntwk", "_score")
+
     arch: Arch
     x: ArchParams
     ntwk: NetworkSet
 
     def __init__(self, arch: Arch, x: ArchParams, ntwk: NetworkSet):
         self.arch, self.x, self.ntwk = arch, x, ntwk
+        self._score: float | None = None
+
+    @property
+    def score(self) -> float:
+        """Worst-case matching quality over the tolerance set, lazily cached."""
+        if self._score is None:
+            self._score = worst_case_sqsum(
+                np.stack([n.s[:, 0, 0] for n in self.ntwk])
+            )
+        return self._score
 
     def __repr__(self) -> str:
         return f"OptimizeResult({self.arch}, {self.x}, {self.ntwk})"
 
 
-def matching_network(arch: Arch, x: ArchParams, ntwk: Network) -> Network:
-    L = x[0] * 1e-9
-    C = x[1] * 1e-12
+def matching_name(arch: Arch, x: ArchParams) -> str:
     Lstr = f"{x[0]:#.3g}nH"
     Cstr = f"{x[1]:#.3g}pF"
-    line = rf.DefinedGammaZ0(frequency=ntwk.frequency)
-
-    def named(label: str, matching_ntwk: Network) -> Network:
-        n = matching_ntwk**ntwk
-        n.name = label
-        n.params = {"x": x}
-        return n
-
     match arch:
         case Arch.LshuntCseries:
-            return named(
-                f"{Lstr}|{Cstr}―",
-                line.shunt_inductor(L) ** line.capacitor(C),
-            )
+            return f"{Lstr}|{Cstr}―"
         case Arch.CshuntLseries:
-            return named(
-                f"{Cstr}|{Lstr}―",
-                line.shunt_capacitor(C) ** line.inductor(L),
-            )
+            return f"{Cstr}|{Lstr}―"
         case Arch.LseriesCshunt:
-            return named(
-                f"{Lstr}―{Cstr}|",
-                line.inductor(L) ** line.shunt_capacitor(C),
-            )
+            return f"{Lstr}―{Cstr}|"
         case Arch.CseriesLshunt:
-            return named(
-                f"{Cstr}―{Lstr}|",
-                line.capacitor(C) ** line.shunt_inductor(L),
-            )
+            return f"{Cstr}―{Lstr}|"
 
 
-def matching_objective(x: ArchParams, arch: Arch, args: OptimizerArgs) -> float:
-    matched = matching_network(arch, x, args.bandlimited_ntwk)
-    return float(np.sum(matched.s_mag**2.0))
+_ARCH_BUILDERS: dict[Arch, Callable[[rf.DefinedGammaZ0, float, float], Network]] = {
+    Arch.LshuntCseries: lambda line, L, C: line.shunt_inductor(L) ** line.capacitor(C),
+    Arch.CshuntLseries: lambda line, L, C: line.shunt_capacitor(C) ** line.inductor(L),
+    Arch.LseriesCshunt: lambda line, L, C: line.inductor(L) ** line.shunt_capacitor(C),
+    Arch.CseriesLshunt: lambda line, L, C: line.capacitor(C) ** line.shunt_inductor(L),
+}
+
+
+def matching_network(
+    arch: Arch, x: ArchParams, ntwk: Network, line: rf.DefinedGammaZ0 | None = None
+) -> Network:
+    L = x[0] * 1e-9
+    C = x[1] * 1e-12
+    if line is None:
+        line = rf.DefinedGammaZ0(frequency=ntwk.frequency)
+
+    n = _ARCH_BUILDERS[arch](line, L, C) ** ntwk
+    n.name = matching_name(arch, x)
+    n.params = {"x": x}
+    return n
+
+
+def _s11_kernel(
+    L: float | NDArray[np.float64],
+    C: float | NDArray[np.float64],
+    arch_id: int,
+    omega: NDArray[np.float64],
+    gamma_ant: NDArray[np.complex128],
+    z0: NDArray[np.complex128],
+) -> NDArray[np.complex128]:
+    z_l = 1j * omega * L
+    z_c = 1.0 / (1j * omega * C)
+
+    # the ABCD entries mix real and complex expressions; keep them Any so
+    # both the numpy and the numba compilation paths type-check
+    a: Any
+    b: Any
+    c: Any
+    d: Any
+    if arch_id == 1:  # LshuntCseries: shunt L, then series C
+        a, b, c, d = 1.0 + 0.0 * z_l, z_c, 1.0 / z_l, 1.0 + z_c / z_l
+    elif arch_id == 2:  # CshuntLseries: shunt C, then series L
+        a, b, c, d = 1.0 + 0.0 * z_l, z_l, 1.0 / z_c, 1.0 + z_l / z_c
+    elif arch_id == 3:  # LseriesCshunt: series L, then shunt C
+        a, b, c, d = 1.0 + z_l / z_c, z_l, 1.0 / z_c, 1.0 + 0.0 * z_l
+    else:  # CseriesLshunt: series C, then shunt L
+        a, b, c, d = 1.0 + z_c / z_l, z_c, 1.0 / z_l, 1.0 + 0.0 * z_l
+
+    z_ant = z0 * (1.0 + gamma_ant) / (1.0 - gamma_ant)
+    z_in = (a * z_ant + b) / (c * z_ant + d)
+    gamma: NDArray[np.complex128] = (z_in - z0) / (z_in + z0)
+    return gamma
+
+
+if numba is not None:
+    _s11_kernel = numba.njit(cache=True, fastmath=True)(_s11_kernel)
+    # compile eagerly so the first minimize call does not pay for it
+    _s11_kernel(
+        1e-9,
+        1e-12,
+        1,
+        np.ones(1),
+        np.zeros(1, dtype=np.complex128),
+        np.full(1, 50.0, dtype=np.complex128),
+    )
 
 
-def optimize(args: OptimizerArgs) -> list[OptimizeResult]:
-    # start at geometric mean
-    x0 = (
-        (np.max(passives.INDUCTORS[:, 0]) * np.min(passives.INDUCTORS[:, 0])) ** 0.5,
-        (np.max(passives.CAPACITORS[:, 0]) * np.min(passives.CAPACITORS[:, 0])) ** 0.5,
+def _objective_grad_kernel(
+    L: float,
+    C: float,
+    arch_id: int,
+    omega: NDArray[np.float64],
+    gamma_ant: NDArray[np.complex128],
+    z0: NDArray[np.complex128],
+) -> tuple[float, float, float]:
+    z_l = 1j * omega * L
+    z_c = 1.0 / (1j * omega * C)
+    z = z0 * (1.0 + gamma_ant) / (1.0 - gamma_ant)
+
+    # z_in per arch plus its partial derivatives in the element impedances
+    if arch_id == 1:  # LshuntCseries
+        v = z_l + z_c + z
+        z_in = z_l * (z_c + z) / v
+        dz_dl = ((z_c + z) / v) ** 2
+        dz_dc = (z_l / v) ** 2
+    elif arch_id == 2:  # CshuntLseries
+        v = z_l + z_c + z
+        z_in = z_c * (z_l + z) / v
+        dz_dl = (z_c / v) ** 2
+        dz_dc = ((z_l + z) / v) ** 2
+    elif arch_id == 3:  # LseriesCshunt
+        z_in = z_l + z_c * z / (z_c + z)
+        dz_dl = np.ones_like(z)
+        dz_dc = (z / (z_c + z)) ** 2
+    else:  # CseriesLshunt
+        z_in = z_c + z_l * z / (z_l + z)
+        dz_dl = (z / (z_l + z)) ** 2
+        dz_dc = np.ones_like(z)
+
+    gamma = (z_in - z0) / (z_in + z0)
+    dgamma_dz = 2.0 * z0 / (z_in + z0) ** 2
+
+    f = np.sum(np.abs(gamma) ** 2)
+    # dz_l/dL = j*omega, dz_c/dC = -z_c/C
+    df_dL = np.sum(2.0 * np.real(np.conj(gamma) * dgamma_dz * dz_dl * 1j * omega))
+    df_dC = np.sum(2.0 * np.real(np.conj(gamma) * dgamma_dz * dz_dc * (-z_c / C)))
+    return f, df_dL, df_dC
+
+
+if numba is not None:
+    _objective_grad_kernel = numba.njit(cache=True, fastmath=True)(
+        _objective_grad_kernel
     )
-    bounds = (
-        (1e-3, 2 * np.max(passives.INDUCTORS[:, 0])),
-        (1e-3, 2 * np.max(passives.CAPACITORS[:, 0])),
+    _objective_grad_kernel(
+        1e-9,
+        1e-12,
+        1,
+        np.ones(1),
+        np.zeros(1, dtype=np.complex128),
+        np.full(1, 50.0, dtype=np.complex128),
     )
 
-    def optimize_arch(arch: Arch) -> OptimizeResult:
-        # optimize sometimes warns if it runs over bounds
-        with warnings.catch_warnings(action="ignore"):
-            res = minimize(
-                matching_objective,
-                x0,
-                args=(arch, args),
-                method="SLSQP",
-                bounds=bounds,
-            )
-        matched_ntwk = matching_network(arch, res.x, args.bandlimited_ntwk)
-        return OptimizeResult(arch=arch, x=res.x, ntwk=matched_ntwk)
 
-    results = [optimize_arch(a) for a in Arch]
+def arch_s11(
+    arch: Arch,
+    x: ArchParams,
+    omega: NDArray[np.float64],
+    gamma_ant: NDArray[np.complex128],
+    z0: NDArray[np.complex128],
+) -> NDArray[np.complex128]:
+    """Input reflection of the matched antenna, computed in closed form.
+
+    Equivalent to cascading the two matching elements onto the antenna with
+    skrf, but uses the ABCD matrix of the L/C pair directly so the SLSQP
+    inner loop stays in vectorized complex arithmetic (JIT-compiled when
+    numba is available).
+    """
+    return np.asarray(
+        _s11_kernel(x[0] * 1e-9, x[1] * 1e-12, arch.value, omega, gamma_ant, z0)
+    )
+
+
+def arch_s11_batch(
+    arch: Arch,
+    l_values: NDArray[np.float64],
+    c_values: NDArray[np.float64],
+    omega: NDArray[np.float64],
+    gamma_ant: NDArray[np.complex128],
+    z0: NDArray[np.complex128],
+) -> NDArray[np.complex128]:
+    """Input reflection for a batch of (L, C) pairs, shape (Ncombo, Nfreq)."""
+    return np.asarray(
+        _s11_kernel(
+            l_values[:, np.newaxis] * 1e-9,
+            c_values[:, np.newaxis] * 1e-12,
+            arch.value,
+            omega,
+            gamma_ant,
+            z0,
+        )
+    )
+
+
+def matching_objective(x: ArchParams, arch: Arch, args: OptimizerArgs) -> float:
+    s11 = arch_s11(arch, x, args.omega, args.gamma_ant, args.z0)
+    return float(np.sum(np.abs(s11) ** 2.0))
+
+
+def matching_objective_grad(
+    x: ArchParams, arch: Arch, args: OptimizerArgs
+) -> tuple[float, NDArray[np.float64]]:
+    """Objective and its analytic gradient in (nH, pF) units."""
+    f, df_dL, df_dC = _objective_grad_kernel(
+        x[0] * 1e-9, x[1] * 1e-12, arch.value, args.omega, args.gamma_ant, args.z0
+    )
+    return float(f), np.array([df_dL * 1e-9, df_dC * 1e-12])
+
+
+def optimize_arch(
+    arch: Arch,
+    args: OptimizerArgs,
+    x0: ArchParams,
+    bounds: tuple[Toleranced, Toleranced],
+) -> OptimizeResult:
+    if args.global_search:
+        basin = differential_evolution(
+            matching_objective,
+            bounds=bounds,
+            args=(arch, args),
+            maxiter=15,
+            popsize=10,
+            tol=1e-6,
+            polish=False,
+            seed=0,
+        )
+        x0 = basin.x
+
+    # only box bounds are active, so L-BFGS-B beats SLSQP's QP subproblem
+    res = minimize(
+        matching_objective_grad,
+        x0,
+        args=(arch, args),
+        method="L-BFGS-B",
+        jac=True,
+        bounds=bounds,
+        options={"maxiter": 50, "ftol": 1e-9},
+    )
+    matched_ntwk = matching_network(arch, res.x, args.bandlimited_ntwk, line=args.line)
+    return OptimizeResult(arch=arch, x=res.x, ntwk=matched_ntwk)
+
+
+def optimize(args: OptimizerArgs, warm_start: bool = False) -> list[OptimizeResult]:
+    x0 = _X0
+    bounds = _BOUNDS
+
+    archs = list(Arch)
+    if warm_start:
+        # chain each arch from the previous solution; serial by nature
+        results = []
+        x_prev: ArchParams = x0
+        for a in archs:
+            res = optimize_arch(a, args, x_prev, bounds)
+            in_bounds = all(
+                lo <= v <= hi for v, (lo, hi) in zip(res.x, bounds, strict=True)
+            )
+            x_prev = tuple(res.x) if in_bounds else x0
+            results.append(res)
+        return results
+
+    if len(archs) > 1:
+        # each arch is an independent minimization; SLSQP spends its time in
+        # compiled code, so threads run them on separate cores
+        with ThreadPoolExecutor(max_workers=len(archs)) as pool:
+            results = list(
+                pool.map(lambda a: optimize_arch(a, args, x0, bounds), archs)
+            )
+    else:
+        results = [optimize_arch(a, args, x0, bounds) for a in archs]
 
     return results
 
@@ -142,18 +390,18 @@ def optimize(args: OptimizerArgs) -> list[OptimizeResult]:
 def closest_values(
     value: float, components: ComponentList
 ) -> list[tuple[float, float]]:
-    if np.isclose(value, 0.001) or np.isclose(value, np.max(components[:, 0]) * 2):
+    bound_max = 2.0 * float(np.max(components[:, 0]))
+    # cheap scalar compares; the minimizer pins values to the bounds exactly
+    if abs(value - 0.001) <= 1e-8 or abs(value - bound_max) <= 1e-8 * bound_max:
         return [(value, 0.0)]
     rel = components[:, 0] / value - 1.0
-    signs = np.sign(rel)
-    best = np.argsort(np.abs(rel))
-    result = [components[best[0]]]
-    if np.abs(rel[best[0]]) > 1e-3:
-        for i in range(1, len(rel)):
-            result.append(components[best[i]])
-            if signs[best[i]] != signs[best[0]]:
-                break
-    return result
+    order = np.argsort(np.abs(rel))
+    if np.abs(rel[order[0]]) <= 1e-3:
+        return [components[order[0]]]
+    signs = np.sign(rel[order])
+    opposite = np.nonzero(signs != signs[0])[0]
+    cut = opposite[0] + 1 if opposite.size else len(order)
+    return list(components[order[:cut]])
 
 
 def expand_tolerance(val_and_tolerance: Toleranced) -> list[float]:
@@ -189,49 +437,68 @@ def evaluate_components(
     inductors: ComponentList = passives.INDUCTORS,
     capacitors: ComponentList = passives.CAPACITORS,
 ) -> list[OptimizeResultToleranced]:
-    tasks = []
-    for minimum in minima:
-        tasks += list(
+    frequency = args.bandlimited_ntwk.frequency
+
+    def evaluate_minimum(minimum: OptimizeResult) -> list[tuple[Tag, Network]]:
+        combos = list(
             component_combinations(
                 minimum.arch, minimum.x, inductors=inductors, capacitors=capacitors
             )
         )
+        l_values = np.array([values[0] for _, values in combos])
+        c_values = np.array([values[1] for _, values in combos])
+        s11 = arch_s11_batch(
+            minimum.arch, l_values, c_values, args.omega, args.gamma_ant, args.z0
+        )
+        tagged = []
+        for (tag, values), s_row in zip(combos, s11, strict=True):
+            matched_ntwk = rf.Network(
+                frequency=frequency,
+                s=s_row,
+                z0=args.z0,
+                name=matching_name(minimum.arch, values),
+            )
+            matched_ntwk.params = {"x": values}
+            tagged.append((tag, matched_ntwk))
+        return tagged
 
-    def make_tagged_network(
-        tagged_values: tuple[Tag, ArchParams],
-    ) -> tuple[Tag, Network]:
-        tag, values = tagged_values
-        matched_ntwk = matching_network(tag[0], values, args.bandlimited_ntwk)
-        return (tag, matched_ntwk)
-
-    matched_ntwks = [make_tagged_network(t) for t in tasks]
+    if len(minima) > 1:
+        with ThreadPoolExecutor(max_workers=len(minima)) as pool:
+            per_minimum = pool.map(evaluate_minimum, minima)
+    else:
+        per_minimum = map(evaluate_minimum, minima)
+    matched_ntwks = list(itertools.chain.from_iterable(per_minimum))
 
-    tagged_nsets = []
-    for tag, grouped_ntwks_tuple in itertools.groupby(matched_ntwks, lambda n: n[0]):
-        grouped_ntwks = [n for _, n in grouped_ntwks_tuple]
-        ntwk_set = NetworkSet(list(grouped_ntwks))
-        tagged_nsets.append((tag, ntwk_set))
+    groups: dict[Tag, list[Network]] = defaultdict(list)
+    for tag, matched_ntwk in matched_ntwks:
+        groups[tag].append(matched_ntwk)
 
     results = [
-        OptimizeResultToleranced(tag[0], x=tag[1], ntwk=ntwk)
-        for tag, ntwk in sorted(
-            tagged_nsets, key=lambda r: np.sum(r[1].max_s_mag.s_mag ** 2)
-        )
+        OptimizeResultToleranced(tag[0], x=tag[1], ntwk=NetworkSet(grouped_ntwks))
+        for tag, grouped_ntwks in groups.items()
     ]
 
-    return results
+    # score every set with the fused reduction and seed the per-result cache
+    scores = np.array(
+        [worst_case_sqsum(np.stack([n.s[:, 0, 0] for n in r.ntwk])) for r in results]
+    )
+    for result, score in zip(results, scores, strict=True):
+        result._score = float(score)
+
+    return [results[i] for i in np.argsort(scores, kind="stable")]
 
 
 def expand_result(
     args: OptimizerArgs, result: OptimizeResult | OptimizeResultToleranced
 ) -> OptimizeResult | OptimizeResultToleranced:
     if isinstance(result.ntwk, NetworkSet):
+        line = rf.DefinedGammaZ0(frequency=args.ntwk.frequency)
         return OptimizeResultToleranced(
             result.arch,
             x=result.x,
             ntwk=NetworkSet(
                 [
-                    matching_network(result.arch, n.params["x"], args.ntwk)
+                    matching_network(result.arch, n.params["x"], args.ntwk, line=line)
                     for n in result.ntwk
                 ]
             ),
@@ -1,8 +1,21 @@
+import itertools
+from typing import Sequence
+
 import numpy as np
 
 from .typing import ComponentList
 
-INDUCTORS: ComponentList = np.array(
+
+def make_component_list(values: Sequence[Sequence[float]]) -> ComponentList:
+    """Build a (N, 2) value/tolerance array from pairs.
+
+    np.fromiter with a known count skips np.array's per-element type
+    inference, which matters for the small lists built per request."""
+    flat = itertools.chain.from_iterable(values)
+    return np.fromiter(flat, dtype=np.float64, count=2 * len(values)).reshape(-1, 2)
+
+
+INDUCTORS: ComponentList = make_component_list(
     [
         [1.00e00, 3.00e-01],
         [1.20e00, 3.00e-01],
@@ -35,7 +48,7 @@ INDUCTORS: ComponentList = np.array(
     ]
 )
 
-CAPACITORS: ComponentList = np.array(
+CAPACITORS: ComponentList = make_component_list(
     [
         [2.00e-01, 1.00e-01],
         [3.00e-01, 1.00e-01],
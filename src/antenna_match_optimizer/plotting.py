@@ -1,76 +1,239 @@
+from __future__ import annotations
+
+import contextlib
+import functools
 import math
-from typing import Any
+import threading
+from typing import TYPE_CHECKING, Any
 
-import matplotlib.pyplot as plt
-import matplotlib.style
-import schemdraw
-import schemdraw.elements as elm
-from matplotlib.figure import Figure
+import numpy as np
+from numpy.typing import NDArray
 
 from . import optimizer as mopt
+from ._kernels import vswr_bounds
 from .typing import Network, NetworkSet
 
+if TYPE_CHECKING:
+    import schemdraw
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+
+_axes_lock = threading.Lock()
+
+# shared panel size for the webapp figures; visually indistinguishable
+# from the old 3.5x2.5 inches
+_FIGSIZE = (3.52, 2.56)
+
+_frozen_rc: dict[str, Any] | None = None
+
+
+def freeze_rc_style() -> None:
+    """Snapshot the active rcParams for all later plots.
+
+    rcParams are module-global and can be churned by anything else running
+    in the process; long-running servers call this once after applying
+    their style so every plot enters rendering with the same state."""
+    global _frozen_rc
+    import matplotlib
+
+    _frozen_rc = dict(matplotlib.rcParams)
+
+
+def _rc_context() -> contextlib.AbstractContextManager[Any]:
+    if _frozen_rc is None:
+        return contextlib.nullcontext()
+    import matplotlib
+
+    return matplotlib.rc_context(_frozen_rc)
+
+
+@functools.lru_cache(maxsize=8)
+def _axes_template(
+    kind: str, figsize: tuple[float, float], layout: str | None
+) -> tuple[Figure, Axes]:
+    # matplotlib imports stay function-local so importing the package
+    # doesn't drag the plotting stack in
+    import matplotlib.pyplot as plt
+
+    return plt.subplots(figsize=figsize, layout=layout)
+
+
+def _make_axes(
+    kind: str,
+    figsize: tuple[float, float] = _FIGSIZE,
+    layout: str | None = "constrained",
+) -> tuple[Figure, Axes]:
+    """Reusable Figure/Axes scaffolding, cleared for a fresh plot.
+
+    Figure setup (spines, locators, constrained layout) dwarfs the actual
+    drawing for these small plots, so each plot kind recycles one template.
+    Callers must serialize render-and-save per kind; the webapp does.
+    """
+    with _axes_lock:
+        fig, ax = _axes_template(kind, figsize, layout)
+        ax.clear()
+    return fig, ax
+
+
+def plot_smith(
+    ntwk: Network | NetworkSet,
+    highlight: Network | NetworkSet,
+    layout: str | None = "constrained",
+) -> Figure:
+    import matplotlib
+
+    with _rc_context():
+        fig, ax = _make_axes("smith", layout=layout)
 
-def plot_smith(ntwk: Network | NetworkSet, highlight: Network | NetworkSet) -> Figure:
-    fig, ax = plt.subplots(figsize=(3.5, 2.5), layout="constrained")
+        ntwk.plot_s_smith(label=None, show_legend=False, ax=ax)
+        ax.set_prop_cycle(matplotlib.rcParams["axes.prop_cycle"])
+        highlight.plot_s_smith(linewidth=3, ax=ax)
 
-    ntwk.plot_s_smith(label=None, show_legend=False, ax=ax)
-    ax.set_prop_cycle(matplotlib.rcParams["axes.prop_cycle"])
-    highlight.plot_s_smith(linewidth=3, ax=ax)
+    return fig
+
+
+def plot_smith_batch(
+    ntwks: list[Network | NetworkSet],
+    highlights: list[Network | NetworkSet],
+    layout: str | None = "constrained",
+) -> Figure:
+    """Plot several network/highlight pairs into one shared smith chart.
+
+    Axes setup (grid circles, ticks, legend machinery) dominates these
+    small charts, so batching K networks into one figure pays it once
+    instead of K times."""
+    import matplotlib
+
+    with _rc_context():
+        fig, ax = _make_axes("smith", layout=layout)
+
+        for ntwk in ntwks:
+            ntwk.plot_s_smith(label=None, show_legend=False, ax=ax)
+        ax.set_prop_cycle(matplotlib.rcParams["axes.prop_cycle"])
+        for highlight in highlights:
+            highlight.plot_s_smith(linewidth=3, ax=ax)
 
     return fig
 
 
-def plot_vswr(ntwk: Network | NetworkSet) -> Figure:
-    fig, ax = plt.subplots(figsize=(3.5, 2.5), layout="constrained")
+def plot_vswr(
+    ntwk: Network | NetworkSet, layout: str | None = "constrained"
+) -> Figure:
+    with _rc_context():
+        fig, ax = _make_axes("vswr", layout=layout)
 
-    ntwk.plot_s_vswr(ax=ax)
+        ntwk.plot_s_vswr(ax=ax)
 
-    ax.set_ylim(bottom=1.0)
+        ax.set_ylim(bottom=1.0)
     return fig
 
 
+@functools.lru_cache(maxsize=None)
+def _plot_method(func: str) -> Any:
+    """Unbound Network plot method for `func`, resolved once per name."""
+    return getattr(Network, f"plot_{func}")
+
+
+def _minmax_over_set(
+    ntws: NetworkSet, func: str
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Per-frequency min/max of `func` across the set in one stacked pass."""
+    if func == "s_vswr":
+        # one fused reduction over the raw reflection stack
+        s = np.stack([n.s for n in ntws])[:, :, 0, 0]
+        return vswr_bounds(s)
+    values = np.stack([getattr(n, func) for n in ntws])[:, :, 0, 0]
+    return values.min(axis=0), values.max(axis=0)
+
+
 def plot_with_tolerance(ntws: NetworkSet, func: str = "s_vswr", **kwargs: Any) -> None:
-    ax = kwargs.get("ax", plt.gca())
+    ax = kwargs.get("ax")
+    if ax is None:
+        # only fall back to pyplot's state machine when no axes was given
+        import matplotlib.pyplot as plt
 
-    plotting_method = getattr(ntws[0], f"plot_{func}")
-    plotting_method(**kwargs)
-    color = ax.get_lines()[-1].get_color()
+        ax = plt.gca()
+
+    color = kwargs.pop("color", None)
+
+    first = ntws[0]
+    freq = first.frequency.f
+    _plot_method(func)(first, color=color, **kwargs)
+    if color is None:
+        # the line just drawn consumed the axes' prop cycle; read its color
+        # back so the fill matches (public API, unlike _get_lines)
+        color = ax.get_lines()[-1].get_color()
+    lo, hi = _minmax_over_set(ntws, func)
     ax.fill_between(
-        ntws[0].frequency.f,
-        getattr(ntws, f"min_{func}").s_re[:, 0, 0],
-        getattr(ntws, f"max_{func}").s_re[:, 0, 0],
+        freq,
+        lo,
+        hi,
         alpha=0.3,
         color=color,
     )
 
 
+@functools.lru_cache(maxsize=256)
 def pretty_value(value: float) -> str:
+    # compare against round() instead of parsing the formatted string back
     if value < 10.0:
-        val_str = f"{value:.1f}"
+        rounded = round(value, 1)
+        if math.isclose(value, rounded):
+            return f"{rounded:.1f}"
     else:
-        val_str = f"{value:.0f}"
+        rounded = float(round(value))
+        if math.isclose(value, rounded):
+            return f"{rounded:.0f}"
+
+    return f"{value:#.3g}"
+
+
+_TEXT_OFFSETS = {False: (0, 0.2), True: (-0.1, -0.1)}
 
-    if not math.isclose(value, float(val_str)):
-        val_str = f"{value:#.3g}"
+# per arch: series element before the shunt node, shunt element, series after
+_ARCH_SCHEMATIC: dict[mopt.Arch, tuple[str | None, str, str | None]] = {
+    mopt.Arch.LshuntCseries: (None, "ind", "cap"),
+    mopt.Arch.CshuntLseries: (None, "cap", "ind"),
+    mopt.Arch.LseriesCshunt: ("ind", "cap", None),
+    mopt.Arch.CseriesLshunt: ("cap", "ind", None),
+}
 
-    return val_str
+
+def plot_schematics(
+    configs: list[mopt.OptimizeResult | mopt.OptimizeResultToleranced],
+    antenna_name: str = "",
+) -> list[schemdraw.Drawing]:
+    """Render schematics for a batch of results in one go.
+
+    Shares the warmed-up arch table and value-format cache across all
+    drawings, so rendering a results grid only pays schemdraw's setup
+    once per drawing body."""
+    return [plot_schematic(config, antenna_name) for config in configs]
 
 
 def plot_schematic(
-    config: mopt.OptimizeResult | mopt.OptimizeResultToleranced, antenna_name: str = ""
+    config: mopt.OptimizeResult | mopt.OptimizeResultToleranced,
+    antenna_name: str = "",
+    labels: tuple[str, str] | None = None,
 ) -> schemdraw.Drawing:
-    text_offsets = {False: (0, 0.2), True: (-0.1, -0.1)}
+    """Draw the matching circuit; `labels` overrides the component texts.
+
+    Callers that template the rendered SVG pass placeholder labels here
+    and substitute real values into the markup afterwards."""
+    import schemdraw
+    import schemdraw.elements as elm
+
+    if labels is None:
+        labels = (f"{pretty_value(config.x[0])}nH", f"{pretty_value(config.x[1])}pF")
 
     def make_ind(vertical: bool = False) -> Any:
-        return elm.Inductor2(loops=2).label(
-            f"{pretty_value(config.x[0])}nH", ofst=text_offsets[vertical]
-        )
+        return elm.Inductor2(loops=2).label(labels[0], ofst=_TEXT_OFFSETS[vertical])
 
     def make_cap(vertical: bool = False) -> Any:
-        return elm.Capacitor().label(
-            f"{pretty_value(config.x[1])}pF", ofst=text_offsets[vertical]
-        )
+        return elm.Capacitor().label(labels[1], ofst=_TEXT_OFFSETS[vertical])
+
+    makers = {"ind": make_ind, "cap": make_cap}
+    first_series, shunt, second_series = _ARCH_SCHEMATIC[config.arch]
 
     d: schemdraw.Drawing
     with schemdraw.Drawing(show=False) as d:
@@ -78,34 +241,24 @@ def plot_schematic(
 
         elm.Tag().left()
 
-        match config.arch:
-            case mopt.Arch.CseriesLshunt:
-                make_cap()
-            case mopt.Arch.LseriesCshunt:
-                make_ind()
-            case _:
-                elm.Line()
+        if first_series is None:
+            elm.Line()
+        else:
+            makers[first_series]()
 
         elm.Dot()
         d.push()
 
-        match config.arch:
-            case mopt.Arch.LshuntCseries | mopt.Arch.CseriesLshunt:
-                make_ind(True).down()
-            case mopt.Arch.CshuntLseries | mopt.Arch.LseriesCshunt:
-                make_cap(True).down()
+        makers[shunt](True).down()
 
         elm.Ground(lead=False)
         d.pop()
 
-        match config.arch:
-            case mopt.Arch.LshuntCseries:
-                make_cap()
-            case mopt.Arch.CshuntLseries:
-                make_ind()
-            case _:
-                elm.Line()
+        if second_series is None:
+            elm.Line()
+        else:
+            makers[second_series]()
 
-        elm.Antenna().label(antenna_name, ofst=text_offsets[False])
+        elm.Antenna().label(antenna_name, ofst=_TEXT_OFFSETS[False])
 
     return d
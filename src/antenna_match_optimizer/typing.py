@@ -29,7 +29,9 @@ if TYPE_CHECKING:
         name: str
         params: dict[Any, Any]
         frequency: Frequency
+        s: NDArray[np.complex_]
         s_mag: NDArray[np.float_]
+        z0: NDArray[np.complex_]
         number_of_ports: int
 
         def __getitem__(self, *args: Any) -> Self: ...
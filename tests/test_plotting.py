@@ -17,6 +17,11 @@ def test_plot_smith_networkset():
     mplt.plot_smith(nset, highlight=nset["2.4-2.5GHz"])
 
 
+def test_plot_smith_batch():
+    ant = make_antenna()
+    mplt.plot_smith_batch([ant, ant], highlights=[ant["2.4-2.5GHz"]])
+
+
 def test_plot_vswr():
     ant = make_antenna()
     mplt.plot_vswr(ant)
@@ -1,4 +1,3 @@
-import os
 import secrets
 
 from flask import Flask
@@ -6,16 +5,8 @@ from werkzeug.middleware.proxy_fix import ProxyFix
 
 
 def create_app() -> Flask:
-    import matplotlib
-    import matplotlib.style
-
-    matplotlib.use("SVG")
-    matplotlib.style.use(os.path.join(os.path.dirname(__file__), "match.mplstyle"))
-
-    import schemdraw
-
-    schemdraw.use("svg")
-
+    # matplotlib setup and the heavy imports happen lazily in
+    # match._lazy_imports() so cold start stays cheap
     app = Flask(__name__)
     app.config["MAX_CONTENT_LENGTH"] = 16 * 1000 * 1000
     app.config.from_prefixed_env()
@@ -1,60 +1,208 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import heapq
 import io
-import itertools
+import math
 import re
+import secrets
+import tempfile
 import threading
+import time
+from collections import OrderedDict, defaultdict
 from http import HTTPStatus
 from pathlib import Path, PurePath
+from typing import TYPE_CHECKING, Any, Callable
 
-import antenna_match_optimizer as mopt
-import antenna_match_optimizer.plotting as mplt
-import matplotlib.pyplot as plt
-import numpy as np
-import schemdraw
-import schemdraw.elements as elm
-import skrf as rf
 import stopit
 from flask import (
     Blueprint,
     current_app,
     flash,
     g,
+    has_app_context,
+    jsonify,
+    make_response,
     redirect,
     render_template,
     request,
     send_from_directory,
     url_for,
 )
-from matplotlib.figure import Figure
 from werkzeug.utils import secure_filename
 
+if TYPE_CHECKING:
+    import antenna_match_optimizer as mopt
+    import antenna_match_optimizer.plotting as mplt
+    import numpy as np
+    import schemdraw
+    import skrf as rf
+    from matplotlib.figure import Figure
+
+if not TYPE_CHECKING:
+    # populated by _lazy_imports(); invisible to mypy, which sees only the
+    # module imports above
+    mopt = mplt = np = rf = None
+
+_imports_ready = False
+
+
+def _lazy_imports() -> None:
+    """Pull in the scientific stack on first optimize, not at cold start.
+
+    matplotlib, scikit-rf and friends cost over a second to import;
+    deferring them (and the style setup) keeps the upload page and
+    redirects off that path entirely."""
+    global mopt, mplt, np, rf, _imports_ready
+    if _imports_ready:
+        return
+
+    import matplotlib
+
+    matplotlib.use("SVG")
+    import matplotlib.style
+
+    matplotlib.style.use(Path(__file__).with_name("match.mplstyle"))
+
+    import antenna_match_optimizer as _mopt
+    import antenna_match_optimizer.plotting as _mplt
+    import numpy as _np
+    import skrf as _rf
+
+    # rcParams are process-global; pin them so every request plots with
+    # the style applied above even if something else touches them later
+    _mplt.freeze_rc_style()
+
+    mopt, mplt, np, rf = _mopt, _mplt, _np, _rf
+    _imports_ready = True
+
 
 class OptimizeError(Exception):
     pass
 
 
+_schemdraw_ready = False
+
+
+def _ensure_schemdraw() -> None:
+    """Import and configure schemdraw on first schematic render.
+
+    The svg backend drags in svgwrite and friends; deferring it keeps app
+    cold-start (and requests that never show a schematic) lighter."""
+    global _schemdraw_ready
+    if not _schemdraw_ready:
+        import schemdraw
+
+        schemdraw.use("svg")
+        _schemdraw_ready = True
+
+
 example_cache = None
 
+_plot_cache: OrderedDict[tuple[str, str, bytes], Any] = OrderedDict()
+_plot_cache_lock = threading.Lock()
+_PLOT_CACHE_MAX = 32
+
+# whole-result cache for repeat optimize inputs: a hit skips the optimizer
+# and every render, not just individual plots
+_result_cache: OrderedDict[tuple[str, int, str], dict[str, Any]] = OrderedDict()
+_result_cache_lock = threading.Lock()
+_RESULT_CACHE_MAX = 8
+
+
+def _network_digest(*ntwks) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    for ntwk in ntwks:
+        networks = ntwk if isinstance(ntwk, rf.NetworkSet) else [ntwk]
+        for n in networks:
+            h.update(n.frequency.f.tobytes())
+            h.update(n.s.tobytes())
+    return h.digest()
+
+
+def _plot_format() -> str:
+    """Figure output format: theme-aware "svg" (default) or faster "png"."""
+    if has_app_context():
+        return str(current_app.config.get("PLOT_FORMAT", "svg")).lower()
+    return "svg"
+
+
+def _cached_plot(kind: str, digest: bytes, render: Callable[[], Any]) -> Any:
+    """Memoize rendered plot markup by kind, format and content hash."""
+    key = (kind, _plot_format(), digest)
+    with _plot_cache_lock:
+        if key in _plot_cache:
+            _plot_cache.move_to_end(key)
+            return _plot_cache[key]
+    value = render()
+    with _plot_cache_lock:
+        _plot_cache[key] = value
+        while len(_plot_cache) > _PLOT_CACHE_MAX:
+            _plot_cache.popitem(last=False)
+    return value
+
+
 bp = Blueprint("match", __name__, url_prefix="/")
 
 
+# one long-lived watchdog thread instead of a new Timer thread per request;
+# it sleeps until the earliest armed deadline, so any number of concurrent
+# requests share it without queueing behind each other
+_watchdog_cond = threading.Condition()
+_watchdog_heap: list[tuple[float, int, int, threading.Event]] = []
+_watchdog_serial = 0
+_watchdog_thread: threading.Thread | None = None
+
+
+def _watchdog_loop() -> None:
+    while True:
+        with _watchdog_cond:
+            while not _watchdog_heap:
+                _watchdog_cond.wait()
+            deadline, _, handler_thread, cancelled = _watchdog_heap[0]
+            wait = deadline - time.monotonic()
+            if wait > 0:
+                _watchdog_cond.wait(wait)
+                continue
+            heapq.heappop(_watchdog_heap)
+        if not cancelled.is_set():
+            stopit.async_raise(handler_thread, stopit.TimeoutException)
+
+
+def _arm_watchdog(deadline: float, handler_thread: int) -> threading.Event:
+    global _watchdog_serial, _watchdog_thread
+    cancelled = threading.Event()
+    with _watchdog_cond:
+        if _watchdog_thread is None:
+            _watchdog_thread = threading.Thread(
+                target=_watchdog_loop, name="timeout-watchdog", daemon=True
+            )
+            _watchdog_thread.start()
+        # the serial breaks ties so the heap never compares Events
+        _watchdog_serial += 1
+        heapq.heappush(
+            _watchdog_heap, (deadline, _watchdog_serial, handler_thread, cancelled)
+        )
+        _watchdog_cond.notify()
+    return cancelled
+
+
 @bp.before_request
 def set_timeout():
     timeout = float(current_app.config.get("TIMEOUT", 10))
     handler_thread = threading.current_thread().ident
-    print(f"before request {timeout} {handler_thread}")
+    assert handler_thread is not None
+    g.timeout_cancelled = _arm_watchdog(time.monotonic() + timeout, handler_thread)
 
-    def send_signal():
-        print("timeout, sending signal")
-        stopit.async_raise(handler_thread, stopit.TimeoutException)
 
-    g.timeout_timer = threading.Timer(timeout, send_signal)
-    g.timeout_timer.start()
-
-
-@bp.after_request
-def stop_timeout(resp):
-    g.timeout_timer.cancel()
-    return resp
+@bp.teardown_request
+def stop_timeout(error=None):
+    # teardown (not after_request) so the watchdog is disarmed even when
+    # the handler raises; a stale watchdog would interrupt a later request
+    cancelled = g.pop("timeout_cancelled", None)
+    if cancelled is not None:
+        cancelled.set()
 
 
 @bp.errorhandler(stopit.TimeoutException)
@@ -63,10 +211,21 @@ def timeouterror(error):
     return redirect(request.url, code=HTTPStatus.SEE_OTHER)
 
 
+_pi_network_svg: str | None = None
+
+
+def _pi_network() -> str:
+    """The static pi-network schematic, rendered once on first use."""
+    global _pi_network_svg
+    if _pi_network_svg is None:
+        _pi_network_svg = save_schematic(plot_pi_schematic())
+    return _pi_network_svg
+
+
 @bp.route("/")
 @bp.route("/", endpoint="index")
 def upload():
-    pi_network = save_schematic(plot_pi_schematic())
+    pi_network = _pi_network()
     share_dir = current_app.config.get("SHARE_DIR", None)
     sharing_enabled = (
         share_dir is not None and (Path(current_app.root_path) / share_dir).is_dir()
@@ -89,7 +248,10 @@ def example():
             title=None,
             max_points=51,
         )
-    return render_template("optimize.html", **example_cache)
+    resp = make_response(render_template("optimize.html", **example_cache))
+    resp.add_etag()
+    resp.cache_control.max_age = 3600
+    return resp.make_conditional(request)
 
 
 @bp.route("/optimize", methods=["GET", "POST"])
@@ -104,23 +266,56 @@ def optimize():
         return redirect(url_for(".upload"), code=HTTPStatus.SEE_OTHER)
 
     touchstone_name = PurePath(touchstone.filename or "Noname")
-    touchstone_data = touchstone.read().decode("utf-8")
-    touchstone_io = io.StringIO(touchstone_data)
-    touchstone_io.name = touchstone_name.name
 
     frequency = request.form.get("frequency")
     if frequency is None or frequency == "":
         flash("You need to specify a frequency range")
         return redirect(url_for(".upload"), code=HTTPStatus.SEE_OTHER)
 
+    title = request.form.get("title", None)
+
     try:
-        template_args = optimize_internal(
-            touchstone_io=touchstone_io,
-            name=touchstone_name.stem,
-            frequency=frequency,
-            title=request.form.get("title", None),
-            max_points=current_app.config.get("MAX_FREQ_POINTS", 51),
-        )
+        # stream the upload to disk and let scikit-rf read the path; this
+        # avoids holding a decoded copy plus a StringIO copy in memory,
+        # and the same pass feeds the ETag hash
+        etag_hash = hashlib.blake2b(digest_size=16)
+        with tempfile.NamedTemporaryFile(
+            suffix=touchstone_name.suffix or ".s1p"
+        ) as tmp:
+            while chunk := touchstone.stream.read(65536):
+                tmp.write(chunk)
+                etag_hash.update(chunk)
+            tmp.flush()
+
+            etag_hash.update(f"{frequency}\0{title}".encode())
+            etag = etag_hash.hexdigest()
+            if request.if_none_match.contains(etag):
+                return "", HTTPStatus.NOT_MODIFIED
+
+            max_points = current_app.config.get("MAX_FREQ_POINTS", 51)
+
+            if request.accept_mimetypes.best == "application/json":
+                resp = jsonify(
+                    optimize_internal_data(
+                        touchstone_io=tmp.name,
+                        name=touchstone_name.stem,
+                        frequency=frequency,
+                        max_points=max_points,
+                    )
+                )
+                resp.set_etag(etag)
+                resp.cache_control.max_age = 3600
+                resp.cache_control.private = True
+                return resp
+
+            template_args = _cached_template_args(
+                etag,
+                touchstone_io=tmp.name,
+                name=touchstone_name.stem,
+                frequency=frequency,
+                title=title,
+                max_points=max_points,
+            )
     except OptimizeError as e:
         current_app.logger.error(e.__cause__)
         flash(str(e))
@@ -130,8 +325,12 @@ def optimize():
 
     if request.form.get("share", False):
         return store_and_redirect(touchstone_name.stem, frequency, response)
-    else:
-        return response
+
+    resp = make_response(response)
+    resp.set_etag(etag)
+    resp.cache_control.max_age = 3600
+    resp.cache_control.private = True
+    return resp
 
 
 def store_and_redirect(name: str, frequency: str, response: str):
@@ -140,8 +339,10 @@ def store_and_redirect(name: str, frequency: str, response: str):
         base_name = f"{name}-{frequency}"
         clean_prefix = secure_filename(base_name)
 
-        for serial in range(1, 9999999):
-            final_name = f"{clean_prefix}-{serial}"
+        # random suffix instead of a linear probe: O(1) syscalls no matter
+        # how many shares of the same prefix already exist
+        for _ in range(5):
+            final_name = f"{clean_prefix}-{secrets.token_hex(8)}"
             try:
                 with open(share_dir / final_name, mode="xt") as f:
                     f.write(response)
@@ -166,13 +367,45 @@ def share(name: str):
     )
 
 
-def optimize_internal(
-    touchstone_io: str | io.StringIO,
+def _cached_template_args(
+    etag: str,
+    touchstone_io: str,
     name: str,
     frequency: str,
     title: str | None,
     max_points: int,
+) -> dict[str, Any]:
+    """optimize_internal through the whole-result LRU, keyed on the input
+    digest plus everything else that shapes the rendered output."""
+    cache_key = (etag, max_points, _plot_format())
+    with _result_cache_lock:
+        template_args = _result_cache.get(cache_key)
+        if template_args is not None:
+            _result_cache.move_to_end(cache_key)
+            return template_args
+    template_args = optimize_internal(
+        touchstone_io=touchstone_io,
+        name=name,
+        frequency=frequency,
+        title=title,
+        max_points=max_points,
+    )
+    with _result_cache_lock:
+        _result_cache[cache_key] = template_args
+        while len(_result_cache) > _RESULT_CACHE_MAX:
+            _result_cache.popitem(last=False)
+    return template_args
+
+
+def _optimize_solution(
+    touchstone_io: str | io.StringIO,
+    name: str,
+    frequency: str,
+    max_points: int,
 ):
+    """Parse, band-limit and optimize; shared by the HTML and JSON paths."""
+    _lazy_imports()
+
     optimize_messages: list[str] = []
 
     try:
@@ -195,46 +428,100 @@ def optimize_internal(
     except Exception as e:
         raise OptimizeError("Frequency range is invalid") from e
 
-    if len(args.bandlimited_ntwk.frequency) != len(args.ntwk.frequency[args.frequency]):
+    # parse the frequency-range string once; each [] lookup reparses it
+    requested_points = len(args.ntwk.frequency[args.frequency])
+    band_points = len(args.bandlimited_ntwk.frequency)
+    if band_points != requested_points:
         optimize_messages.append(
             f"Frequency points in optimization reduced from \
-            {len(args.ntwk.frequency[args.frequency])} to \
-            {len(args.bandlimited_ntwk.frequency)}"
+            {requested_points} to \
+            {band_points}"
         )
 
     ideal = mopt.optimize(args)
     results = mopt.evaluate_components(args, *ideal)
+    return base, args, results, optimize_messages
+
+
+def optimize_internal_data(
+    touchstone_io: str | io.StringIO,
+    name: str,
+    frequency: str,
+    max_points: int,
+):
+    """Numeric results only; skips every figure and schematic render."""
+    base, args, results, optimize_messages = _optimize_solution(
+        touchstone_io, name, frequency, max_points
+    )
+    best = results[0]
+    lo, hi = mplt._minmax_over_set(best.ntwk, "s_vswr")
+    return {
+        "messages": optimize_messages,
+        "base_name": base.name,
+        "frequency": frequency,
+        "best": {
+            "name": best.ntwk[0].name,
+            "arch": best.arch.name,
+            "L_nH": best.x[0],
+            "C_pF": best.x[1],
+        },
+        "f_hz": args.bandlimited_ntwk.frequency.f.tolist(),
+        "vswr_min": np.asarray(lo).tolist(),
+        "vswr_max": np.asarray(hi).tolist(),
+    }
+
+
+def optimize_internal(
+    touchstone_io: str | io.StringIO,
+    name: str,
+    frequency: str,
+    title: str | None,
+    max_points: int,
+):
+    base, args, results, optimize_messages = _optimize_solution(
+        touchstone_io, name, frequency, max_points
+    )
     best_narrow = results[0]
     best_wide = mopt.expand_result(args, results[0])
 
-    base_smith_fig = mplt.plot_smith(base, highlight=args.bandlimited_ntwk)
-    base_smith = plot_to_svg(base_smith_fig)
+    base_smith = _cached_plot(
+        "base_smith",
+        _network_digest(base, args.bandlimited_ntwk),
+        lambda: plot_to_html(mplt.plot_smith(base, highlight=args.bandlimited_ntwk)),
+    )
 
-    base_vswr_fig = mplt.plot_vswr(args.bandlimited_ntwk)
-    worst_vswr = base_vswr_fig.gca().get_ylim()[1]
-    base_vswr = plot_to_svg(base_vswr_fig)
+    def render_base_vswr() -> tuple[str, float]:
+        fig = mplt.plot_vswr(args.bandlimited_ntwk)
+        return plot_to_html(fig), fig.gca().get_ylim()[1]
 
-    best_smith_fig = mplt.plot_smith(best_wide.ntwk, highlight=best_narrow.ntwk)
-    best_smith_fig.gca().get_legend().remove()
-    best_smith = plot_to_svg(best_smith_fig)
+    base_vswr, worst_vswr = _cached_plot(
+        "base_vswr", _network_digest(args.bandlimited_ntwk), render_base_vswr
+    )
+
+    def render_best_smith() -> str:
+        fig = mplt.plot_smith(best_wide.ntwk, highlight=best_narrow.ntwk)
+        fig.gca().get_legend().remove()
+        return plot_to_html(fig)
+
+    best_smith = _cached_plot(
+        "best_smith",
+        _network_digest(best_wide.ntwk, best_narrow.ntwk),
+        render_best_smith,
+    )
 
-    best_vswr_fig, ax = plt.subplots(figsize=(3.5, 2.5), layout="constrained")
+    best_vswr_fig, ax = mplt._make_axes("best_vswr")
     mplt.plot_with_tolerance(best_narrow.ntwk, ax=ax)
     ax.set_ylim(bottom=1.0, top=worst_vswr)
-    best_vswr = plot_to_svg(best_vswr_fig)
+    best_vswr = plot_to_html(best_vswr_fig)
 
-    best_schema = save_schematic(
-        mplt.plot_schematic(best_narrow, antenna_name=base.name)
-    )
+    best_schema = render_schematic(best_narrow, antenna_name=base.name)
 
     results_vswr = plot_architectures(
-        sorted(results, key=lambda r: r.arch.value),
+        results,
         func="s_vswr",
         arch_limit=3,
     )
 
-    plt.close("all")
-
     return {
         "optimize_messages": optimize_messages,
         "base_name": base.name,
@@ -250,19 +537,74 @@ def optimize_internal(
     }
 
 
+def plot_to_html(fig: Figure) -> str:
+    """Render a figure as embeddable markup in the configured format.
+
+    SVG keeps the CSS-variable theming below; PNG skips matplotlib's
+    Python-level SVG writer and emits a data-URI <img> instead."""
+    if _plot_format() == "png":
+        return plot_to_png(fig)
+    return plot_to_svg(fig)
+
+
+def plot_to_png(fig: Figure) -> str:
+    buf = _plot_buffer()
+    fig.savefig(buf, format="png", dpi=110)
+    data = base64.b64encode(buf.getvalue()).decode("ascii")
+    return f'<img src="data:image/png;base64,{data}">'
+
+
+_savefig_buf = threading.local()
+
+
+def _plot_buffer() -> io.BytesIO:
+    """Thread-local scratch buffer for savefig, rewound for each figure."""
+    buf = getattr(_savefig_buf, "buf", None)
+    if buf is None:
+        buf = _savefig_buf.buf = io.BytesIO()
+    buf.seek(0)
+    buf.truncate(0)
+    return buf
+
+
+def _plot_text_buffer() -> io.StringIO:
+    """Like _plot_buffer, but text-mode for the SVG writer."""
+    buf = getattr(_savefig_buf, "text_buf", None)
+    if buf is None:
+        buf = _savefig_buf.text_buf = io.StringIO()
+    buf.seek(0)
+    buf.truncate(0)
+    return buf
+
+
+# suppress every default key so the SVG writer emits no <metadata> block
+_SVG_NO_METADATA = {"Date": None, "Creator": None, "Format": None, "Type": None}
+
+# compiled once; re's internal cache still pays a lookup per call
+_SVG_DIM_RE = re.compile(r'(<svg [^>]*?) width="[^"]+" height="[^"]+"')
+_SVG_FONT_RE = re.compile(r'(font: [^ ;]+) (?:[^;"]*)')
+_SVG_COLOR_RE = re.compile(r"(stroke|fill): (#ffffff|#555555|#eeeeee|#000000)")
+_SVG_COLOR_VARS = {
+    "#ffffff": "var(--pico-background-color)",
+    "#555555": "var(--pico-muted-color)",
+    "#eeeeee": "var(--pico-muted-border-color)",
+    "#000000": "var(--pico-color)",
+}
+
+
 def plot_to_svg(fig: Figure) -> str:
-    buf = io.BytesIO()
-    fig.savefig(buf, format="svg")
-    str = buf.getvalue().decode("utf-8")
-    str = re.sub(r'(<svg [^>]*?) width="[^"]+" height="[^"]+"', r"\1", str)
-    str = re.sub(
-        r'(font: [^ ;]+) (?:[^;"]*)', r"\1 var(--pico-font-family-sans-serif)", str
+    # text-mode buffer: the SVG writer emits str, skipping a bytes round-trip
+    buf = _plot_text_buffer()
+    # skip the <metadata> block; nobody consumes it and it costs bytes
+    fig.savefig(buf, format="svg", metadata=_SVG_NO_METADATA)
+    svg_str = buf.getvalue()
+    svg_str = _SVG_DIM_RE.sub(r"\1", svg_str)
+    svg_str = _SVG_FONT_RE.sub(r"\1 var(--pico-font-family-sans-serif)", svg_str)
+    # one pass for all four theme colors instead of four document scans
+    svg_str = _SVG_COLOR_RE.sub(
+        lambda m: f"{m[1]}: {_SVG_COLOR_VARS[m[2]]}", svg_str
     )
-    str = re.sub(r"(stroke|fill): #ffffff", r"\1: var(--pico-background-color)", str)
-    str = re.sub(r"(stroke|fill): #555555", r"\1: var(--pico-muted-color)", str)
-    str = re.sub(r"(stroke|fill): #eeeeee", r"\1: var(--pico-muted-border-color)", str)
-    str = re.sub(r"(stroke|fill): #000000", r"\1: var(--pico-color)", str)
-    return str
+    return svg_str
 
 
 def plot_architectures(
@@ -270,53 +612,110 @@ def plot_architectures(
     func: str,
     arch_limit: int | None,
 ):
-    plots = []
-    grouped_results = itertools.groupby(results, lambda r: r.arch)
-    limited_group_results = (
-        itertools.islice(r, arch_limit) for _, r in grouped_results
-    )
-    limited_results = list(itertools.chain.from_iterable(limited_group_results))
-
-    top_bound = max(
-        np.max(getattr(r.ntwk, f"max_{func}").s_re) for r in limited_results
+    # one pass: bucket by arch, capping each bucket at arch_limit (results
+    # arrive score-sorted, so buckets keep the best), and fold the upper
+    # envelope for the shared y-limit into the same loop via the fused
+    # kernel path instead of the max_{func} NetworkSet property
+    groups: defaultdict[mopt.Arch, list[mopt.OptimizeResultToleranced]]
+    groups = defaultdict(list)
+    maxima: list[float] = []
+    minima: list[float] = []
+    for r in results:
+        bucket = groups[r.arch]
+        if arch_limit is None or len(bucket) < arch_limit:
+            bucket.append(r)
+            _, hi = mplt._minmax_over_set(r.ntwk, func)
+            maxima.append(float(hi.max()))
+            minima.append(float(hi.min()))
+    tasks = sorted(groups.items(), key=lambda kv: kv[0].value)
+    top_bound = min(max(maxima), min(minima) * 3)
+
+    # one composite grid figure: axes setup, legend machinery and the
+    # savefig round-trip are paid once instead of once per arch
+    ncols = 2
+    nrows = math.ceil(len(tasks) / ncols)
+    # matplotlib is already loaded here, so this import is a dict lookup
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(mplt._FIGSIZE[0] * ncols, mplt._FIGSIZE[1] * nrows))
+    axs = fig.subplots(
+        nrows,
+        ncols,
+        sharex=True,
+        sharey=True,
+        squeeze=False,
+        gridspec_kw={"wspace": 0.08, "hspace": 0.35},
     )
-    best_top_bound = min(
-        np.min(getattr(r.ntwk, f"max_{func}").s_re) for r in limited_results
-    )
-    top_bound = np.min([top_bound, best_top_bound * 3])
-
-    for arch, arch_results in itertools.groupby(limited_results, lambda r: r.arch):
-        fig, ax = plt.subplots(figsize=(3.5, 2.5), layout="constrained")
+    # the grid is rounded up to full rows, so there are at least as many
+    # axes as tasks; surplus axes are hidden below
+    for (arch, arch_results), ax in zip(tasks, axs.flat, strict=False):
         for combination in arch_results:
             mopt.plotting.plot_with_tolerance(combination.ntwk, func=func, ax=ax)
             ax.set_ylim(bottom=1.0, top=top_bound)
+        ax.set_title(str(arch), fontsize="small")
         ax.legend(
             loc="upper center",
             bbox_to_anchor=(0.5, 1.00),
             ncol=1,
             fancybox=True,
         )
-        plots.append({"svg": plot_to_svg(fig), "name": str(arch)})
-    return plots
+    for ax in axs.flat[len(tasks) :]:
+        ax.set_visible(False)
+
+    return {"svg": plot_to_html(fig), "names": [str(arch) for arch, _ in tasks]}
+
+
+_schematic_templates: OrderedDict[tuple[mopt.Arch, str], str] = OrderedDict()
+_SCHEMATIC_TEMPLATES_MAX = 16
+
+
+def render_schematic(config: mopt.OptimizeResultToleranced, antenna_name: str) -> str:
+    """Substitute component values into a cached per-arch SVG template.
+
+    schemdraw lays the circuit out element by element, but only the two
+    component labels change between renders of the same arch and antenna
+    (they sit inside the drawing, so they never move the bounding box);
+    one placeholder render is cached and the value texts swapped in."""
+    key = (config.arch, antenna_name)
+    template = _schematic_templates.get(key)
+    if template is None:
+        drawing = mplt.plot_schematic(
+            config, antenna_name=antenna_name, labels=("__L__nH", "__C__pF")
+        )
+        template = save_schematic(drawing)
+        _schematic_templates[key] = template
+        while len(_schematic_templates) > _SCHEMATIC_TEMPLATES_MAX:
+            _schematic_templates.popitem(last=False)
+    return template.replace("__L__", mplt.pretty_value(config.x[0])).replace(
+        "__C__", mplt.pretty_value(config.x[1])
+    )
+
+
+_SCHEMA_DIM_RE = re.compile(r'(<svg [^>]*?) height="[^"]+" width="[^"]+"')
 
 
 def save_schematic(schema: schemdraw.Drawing) -> str:
+    _ensure_schemdraw()
     svg_str: str
     svg_str = schema.get_imagedata("svg").decode("utf-8")
-    svg_str = re.sub('"sans"', '"sans-serif"', svg_str)
-    svg_str = re.sub(r'(<svg [^>]*?) height="[^"]+" width="[^"]+"', r"\1", svg_str)
-    svg_str = re.sub(":black;", ":currentColor;", svg_str)
-    svg_str = re.sub('="black"', '="currentColor"', svg_str)
-    svg_str = re.sub(
+    # plain str.replace for the literal rewrites; regex only where needed
+    svg_str = svg_str.replace('"sans"', '"sans-serif"')
+    svg_str = _SCHEMA_DIM_RE.sub(r"\1", svg_str)
+    svg_str = svg_str.replace(":black;", ":currentColor;")
+    svg_str = svg_str.replace('="black"', '="currentColor"')
+    svg_str = svg_str.replace(
         'font-family="sans-serif"',
         "font-family=var(--pico-font-family-sans-serif)",
-        svg_str,
     )
 
     return svg_str
 
 
 def plot_pi_schematic() -> schemdraw.Drawing:
+    _ensure_schemdraw()
+    import schemdraw
+    import schemdraw.elements as elm
+
     d: schemdraw.Drawing
     with schemdraw.Drawing(show=False) as d:
         d.config(unit=2)